@@ -1,4 +1,4 @@
-from enum import Enum
+from enum import Enum, IntEnum
 
 # General
 VERSION = 11.0
@@ -114,6 +114,8 @@ ALMOST_ZERO = 1e-6
 DISK_LIMIT_PERCENTAGE = 0.1
 GIGA_BYTE = 1e9
 DISK_LIMIT_SIZE = 5 * GIGA_BYTE
+DISK_CHECK_INTERVAL = 30  # seconds
+REPORT_WRITE_BUFFER_SIZE = 1 << 20  # bytes
 
 
 class RunMode(Enum):
@@ -123,7 +125,7 @@ class RunMode(Enum):
     RETRY_FAILED = 4
 
 
-class PaymentStatus(Enum):
+class PaymentStatus(IntEnum):
     """
     PAID: payment successfully made.
     FAIL: Some failures happened in the process.
@@ -150,6 +152,9 @@ class PaymentStatus(Enum):
     def __str__(self):
         return self.name
 
+    def __format__(self, format_spec):
+        return format(str(self), format_spec)
+
 
 class RewardsType(Enum):
     ACTUAL = "actual"
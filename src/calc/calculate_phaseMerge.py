@@ -13,21 +13,17 @@ class CalculatePhaseMerge(CalculatePhaseBase):
         super().__init__()
 
     def calculate(self, reward_logs):
-        # if address is in address destination dictionary;
-        # then set payment address to mapped address value
-        for rl in self.filterskipped(reward_logs):
-            rl.ratio6 = rl.ratio
-
-        address_set = set(rl.paymentaddress for rl in self.filterskipped(reward_logs))
-        payment_address_list_dict = {addr: [] for addr in address_set}
-
-        # group payments by paymentaddress
-        for rl in self.filterskipped(reward_logs):
-            payment_address_list_dict[rl.paymentaddress].append(rl)
-
+        # keep skipped payments as they are and
+        # group the others by paymentaddress in a single pass
         reward_data6 = []
-        for rl in self.iterateskipped(reward_logs):
-            reward_data6.append(rl)
+        payment_address_list_dict = {}
+        for rl in reward_logs:
+            if rl.skipped:
+                reward_data6.append(rl)
+                continue
+
+            rl.ratio6 = rl.ratio
+            payment_address_list_dict.setdefault(rl.paymentaddress, []).append(rl)
 
         for addr, rl_list in payment_address_list_dict.items():
             if len(rl_list) > 1:
@@ -19,8 +19,7 @@ class CalculatePhaseZeroBalance(CalculatePhaseBase):
 
     def calculate(self, reward_logs, reactivate_zeroed):
 
-        reward_data7 = []
-
+        # reward logs are updated in place, no copy of the list is made
         for delegate in reward_logs:
 
             # If delegate's current balance is 0, and we are NOT reactivating it,
@@ -49,6 +48,4 @@ class CalculatePhaseZeroBalance(CalculatePhaseBase):
                         )
                     )
 
-            reward_data7.append(delegate)
-
-        return reward_data7
+        return reward_logs
@@ -1,5 +1,3 @@
-import functools
-
 from Constants import MAXIMUM_ROUNDING_ERROR, ALMOST_ZERO
 from calc.calculate_phase0 import CalculatePhase0
 from calc.calculate_phase1 import CalculatePhase1
@@ -10,7 +8,7 @@ from calc.calculate_phase_final import CalculatePhaseFinal
 from model.reward_log import (
     TYPE_FOUNDERS_PARENT,
     TYPE_OWNERS_PARENT,
-    cmp_by_type_balance,
+    key_by_type_balance,
 )
 from log_config import main_logger
 
@@ -128,7 +126,7 @@ class PhasedPaymentCalculator:
         )
 
         # sort rewards according to type and balance
-        rwrd_logs.sort(key=functools.cmp_to_key(cmp_by_type_balance))
+        rwrd_logs.sort(key=key_by_type_balance)
 
         # check if there is difference between sum of calculated amounts and total_rewards
         total_delegator_amounts = int(
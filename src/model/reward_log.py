@@ -119,16 +119,10 @@ def cmp_by_skip_type_balance(rl1, rl2):
             return -1
 
 
-def cmp_by_type_balance(rl1, rl2):
-
-    if rl1.type == rl2.type:
-        if rl1.staking_balance is None:
-            return 1
-        if rl2.staking_balance is None:
-            return -1
-        if rl1.staking_balance == rl2.staking_balance:
-            return 1
-        else:
-            return rl2.staking_balance - rl1.staking_balance
-    else:
-        return types[rl2.type] - types[rl1.type]
+def key_by_type_balance(rl):
+    # type rank descending, then staking balance descending, unknown balances last
+    return (
+        -types[rl.type],
+        rl.staking_balance is None,
+        -rl.staking_balance if rl.staking_balance is not None else 0,
+    )
@@ -1,14 +1,21 @@
-import functools
-import os
+import logging
 import threading
-from time import sleep
-from Constants import MUTEZ_PER_TEZ, VERSION, EXIT_PAYMENT_TYPE, PaymentStatus
+from collections import Counter
+from time import monotonic, sleep
+from uuid import NAMESPACE_URL, uuid3
+from Constants import (
+    DISK_CHECK_INTERVAL,
+    EXIT_PAYMENT_TYPE,
+    MUTEZ_PER_TEZ,
+    VERSION,
+    PaymentStatus,
+)
 from calc.calculate_phaseMapping import CalculatePhaseMapping
 from calc.calculate_phaseMerge import CalculatePhaseMerge
 from calc.calculate_phaseZeroBalance import CalculatePhaseZeroBalance
 from log_config import main_logger
 from model.reward_log import (
-    cmp_by_type_balance,
+    key_by_type_balance,
     TYPE_MERGED,
     TYPE_FOUNDER,
     TYPE_OWNER,
@@ -22,7 +29,8 @@ from util.csv_calculation_file_parser import CsvCalculationFileParser
 from util.dir_utils import (
     get_payment_report_file_path,
     get_calculation_report_file_path,
-    get_busy_file,
+    remove_busy_file,
+    remove_file,
 )
 
 logger = main_logger.getChild("payment_consumer")
@@ -30,17 +38,16 @@ logger = main_logger.getChild("payment_consumer")
 
 def count_and_log_failed(payment_logs):
 
-    nb_paid = nb_failed = nb_injected = 0
-
+    # statuses are used as list indices, UNDEFINED (-1) lands in the last slot
+    counts = [0] * len(PaymentStatus)
     for pymnt_itm in payment_logs:
-        if pymnt_itm.paid == PaymentStatus.PAID:
-            nb_paid += 1
-        elif pymnt_itm.paid == PaymentStatus.FAIL:
-            nb_failed += 1
-        elif pymnt_itm.paid == PaymentStatus.INJECTED:
-            nb_injected += 1
+        counts[pymnt_itm.paid] += 1
 
-    return nb_paid, nb_failed, nb_injected
+    return (
+        counts[PaymentStatus.PAID],
+        counts[PaymentStatus.FAIL],
+        counts[PaymentStatus.INJECTED],
+    )
 
 
 class PaymentConsumer(threading.Thread):
@@ -86,6 +93,7 @@ class PaymentConsumer(threading.Thread):
         self.rewards_type = rewards_type
         self.calculations_dir = calculations_dir
         self.baking_address = baking_address
+        self.stats_uuid = str(uuid3(namespace=NAMESPACE_URL, name=key_name))
 
         logger.debug('Consumer "%s" created', self.name)
 
@@ -93,12 +101,16 @@ class PaymentConsumer(threading.Thread):
 
     def run(self):
         running = True
+        last_disk_check = None
         while running:
-            # Exit if disk is full
+            # Exit if disk is full, checked at most every DISK_CHECK_INTERVAL seconds
             # https://github.com/tezos-reward-distributor-organization/tezos-reward-distributor/issues/504
-            if disk_is_full():
-                running = False
-                break
+            now = monotonic()
+            if last_disk_check is None or now - last_disk_check >= DISK_CHECK_INTERVAL:
+                last_disk_check = now
+                if disk_is_full():
+                    running = False
+                    break
 
             # Wait until a reward is present
             payment_batch = self.payments_queue.get(True)
@@ -121,16 +133,24 @@ class PaymentConsumer(threading.Thread):
                 logger.warn("Exit signal received. Terminating...")
                 return False
 
-            sleep(1)
+            # dry runs do not inject anything, no need to wait
+            if not self.dry_run:
+                sleep(1)
 
             pymnt_cycle = payment_batch.cycle
 
             logger.info("Starting payments for cycle {}".format(pymnt_cycle))
 
-            # Filter out non-payable items
-            payment_items = [pi for pi in payment_items if pi.payable]
-            already_paid_items = [pi for pi in payment_items if pi.paid.is_processed()]
-            payment_items = [pi for pi in payment_items if not pi.paid.is_processed()]
+            # Filter out non-payable items and split off the already paid ones
+            unpaid_items, already_paid_items = [], []
+            for pi in payment_items:
+                if not pi.payable:
+                    continue
+                if pi.paid.is_processed():
+                    already_paid_items.append(pi)
+                else:
+                    unpaid_items.append(pi)
+            payment_items = unpaid_items
 
             # Handle remapping of payment to alternate address
             phaseMapping = CalculatePhaseMapping()
@@ -146,7 +166,7 @@ class PaymentConsumer(threading.Thread):
                 payment_items, self.reactivate_zeroed
             )
 
-            payment_items.sort(key=functools.cmp_to_key(cmp_by_type_balance))
+            payment_items.sort(key=key_by_type_balance)
 
             batch_payer = BatchPayer(
                 self.node_addr,
@@ -170,6 +190,16 @@ class PaymentConsumer(threading.Thread):
             # override batch data
             payment_batch.batch = payment_logs
 
+            # nothing was processed, only the report and the cleanup are needed
+            if not payment_logs:
+                self.create_payment_report(
+                    0, payment_logs, pymnt_cycle, already_paid_items
+                )
+                self.clean_failed_payment_reports(pymnt_cycle, True)
+                if payment_batch.producer_ref:
+                    payment_batch.producer_ref.on_success(payment_batch)
+                return True
+
             # 4- count failed payments
             nb_paid, nb_failed, nb_unknown = count_and_log_failed(payment_logs)
 
@@ -195,26 +225,45 @@ class PaymentConsumer(threading.Thread):
                 if payment_batch.producer_ref:
                     payment_batch.producer_ref.on_fail(payment_batch)
 
-            # 8- send notification via plugins
-            if total_attempts > 0:
+            # 8- publish anonymous stats, in the background while the plugins notify
+            stats_thread = None
+            if self.publish_stats and self.args and not self.dry_run:
+                stats_dict = self.create_stats_dict(
+                    nb_failed,
+                    nb_unknown,
+                    pymnt_cycle,
+                    payment_logs,
+                    total_attempts,
+                )
+                stats_thread = threading.Thread(
+                    target=stats_publisher,
+                    args=(stats_dict,),
+                    name=self.name + "_stats",
+                )
+                stats_thread.start()
+            else:
+                logger.info(
+                    "Anonymous statistics disabled{:s}".format(
+                        ", (Dry run)" if self.dry_run else ""
+                    )
+                )
 
-                subject = "Reward Payouts for Cycle {:d}".format(pymnt_cycle)
+            # 9- send notification via plugins
+            if total_attempts > 0:
 
-                status = ""
                 if nb_failed == 0 and nb_unknown == 0:
-                    status = status + "Completed Successfully!"
+                    status_parts = ["Completed Successfully!"]
                 else:
-                    status = status + "attempted"
+                    status_parts = ["attempted"]
                     if nb_failed > 0:
-                        status = status + ", {:d} failed".format(nb_failed)
+                        status_parts.append("{:d} failed".format(nb_failed))
                     if nb_unknown > 0:
-                        status = (
-                            status
-                            + ", {:d} injected but final state not known".format(
-                                nb_unknown
-                            )
+                        status_parts.append(
+                            "{:d} injected but final state not known".format(nb_unknown)
                         )
-                subject = subject + " " + status
+                subject = "Reward Payouts for Cycle {:d} {:s}".format(
+                    pymnt_cycle, ", ".join(status_parts)
+                )
 
                 admin_message = "The current payout account balance is expected to last for the next {:d} cycle(s)!".format(
                     number_future_payable_cycles
@@ -230,23 +279,8 @@ class PaymentConsumer(threading.Thread):
                     subject, admin_message, [report_file], payment_logs
                 )
 
-            # 9- publish anonymous stats
-            if self.publish_stats and self.args and not self.dry_run:
-                stats_dict = self.create_stats_dict(
-                    self.key_name,
-                    nb_failed,
-                    nb_unknown,
-                    pymnt_cycle,
-                    payment_logs,
-                    total_attempts,
-                )
-                stats_publisher(stats_dict)
-            else:
-                logger.info(
-                    "Anonymous statistics disabled{:s}".format(
-                        ", (Dry run)" if self.dry_run else ""
-                    )
-                )
+            if stats_thread:
+                stats_thread.join()
 
         except Exception:
             logger.error("Error at reward payment", exc_info=True)
@@ -259,8 +293,8 @@ class PaymentConsumer(threading.Thread):
         failure_report_file = get_payment_report_file_path(
             self.payments_dir, payment_cycle, 1
         )
-        if success and os.path.isfile(failure_report_file):
-            os.remove(failure_report_file)
+        if success:
+            remove_file(failure_report_file)
         # 2- generate path of a assumed busy failure report file
         # if it exists, remove it
         ###
@@ -268,9 +302,7 @@ class PaymentConsumer(threading.Thread):
         #  - if payment attempt was successful it is not needed anymore,
         #  - if payment attempt was un-successful, new failedY/cycle.csv is already created.
         # Thus  failed/cycle.csv.BUSY file is not needed and removing it is fine.
-        failure_report_busy_file = get_busy_file(failure_report_file)
-        if os.path.isfile(failure_report_busy_file):
-            os.remove(failure_report_busy_file)
+        remove_busy_file(failure_report_file)
 
     def create_payment_report(
         self, nb_failed, payment_logs, payment_cycle, already_paid_items
@@ -286,14 +318,14 @@ class PaymentConsumer(threading.Thread):
             "Adding {} already paid items to the report".format(len(already_paid_items))
         )
 
-        payouts = already_paid_items + payment_logs
-
-        successful_payouts = [
-            payout for payout in payouts if payout.paid != PaymentStatus.FAIL
-        ]
-        unsuccessful_payouts = [
-            payout for payout in payouts if payout.paid == PaymentStatus.FAIL
-        ]
+        fail = PaymentStatus.FAIL
+        successful_payouts, unsuccessful_payouts = [], []
+        for payouts in (already_paid_items, payment_logs):
+            for payout in payouts:
+                if payout.paid == fail:
+                    unsuccessful_payouts.append(payout)
+                else:
+                    successful_payouts.append(payout)
 
         report_file = get_payment_report_file_path(self.payments_dir, payment_cycle, 0)
         CsvPaymentFileParser().write(report_file, successful_payouts)
@@ -306,16 +338,18 @@ class PaymentConsumer(threading.Thread):
             CsvPaymentFileParser().write(report_file, unsuccessful_payouts)
             logger.info("Payment report is created at '{}'".format(report_file))
 
-        for pl in payment_logs:
-            logger.debug(
-                "Payment done for address {:s} type {:s} amount {:<,d} mutez paid {:s}".format(
-                    pl.address, pl.type, pl.adjusted_amount, pl.paid
+        if logger.isEnabledFor(logging.DEBUG):
+            for pl in payment_logs:
+                logger.debug(
+                    "Payment done for address {:s} type {:s} amount {:<,d} mutez paid {:s}".format(
+                        pl.address, pl.type, pl.adjusted_amount, pl.paid
+                    )
                 )
-            )
 
         return report_file
 
     def add_transaction_fees_to_calculation_report(self, payment_logs, payment_cycle):
+        report_file = None
         if self.calculations_dir is not None:
             report_file = get_calculation_report_file_path(
                 self.calculations_dir, payment_cycle
@@ -328,19 +362,14 @@ class PaymentConsumer(threading.Thread):
                 early_payout,
             ) = CsvCalculationFileParser().parse(report_file, self.baking_address)
 
-            payment_logs_dict = {}
-            for pl in payment_logs:
-                payment_logs_dict.__setitem__(pl.address, pl)
+            payment_logs_dict = {pl.address: pl for pl in payment_logs}
 
             for rl in reward_logs_from_report:
                 # overwrite only delegate_transaction_fee and delegator_transaction_fee in report csv file, leave the rest alone
-                if rl.address in payment_logs_dict:
-                    rl.delegate_transaction_fee = payment_logs_dict[
-                        rl.address
-                    ].delegate_transaction_fee
-                    rl.delegator_transaction_fee = payment_logs_dict[
-                        rl.address
-                    ].delegator_transaction_fee
+                pl = payment_logs_dict.get(rl.address)
+                if pl is not None:
+                    rl.delegate_transaction_fee = pl.delegate_transaction_fee
+                    rl.delegator_transaction_fee = pl.delegator_transaction_fee
                 else:
                     rl.desc += "Not in payment log. "
 
@@ -362,7 +391,6 @@ class PaymentConsumer(threading.Thread):
 
     def create_stats_dict(
         self,
-        key_name,
         nb_failed,
         nb_unknown,
         payment_cycle,
@@ -370,20 +398,22 @@ class PaymentConsumer(threading.Thread):
         total_attempts,
     ):
 
-        from uuid import NAMESPACE_URL, uuid3
+        type_counts = Counter()
+        total_amount = 0
+        for pl in payment_logs:
+            type_counts[pl.type] += 1
+            total_amount += pl.adjusted_amount
 
-        n_f_type = len([pl for pl in payment_logs if pl.type == TYPE_FOUNDER])
-        n_o_type = len([pl for pl in payment_logs if pl.type == TYPE_OWNER])
-        n_d_type = len([pl for pl in payment_logs if pl.type == TYPE_DELEGATOR])
-        n_m_type = len([pl for pl in payment_logs if pl.type == TYPE_MERGED])
+        n_f_type = type_counts[TYPE_FOUNDER]
+        n_o_type = type_counts[TYPE_OWNER]
+        n_d_type = type_counts[TYPE_DELEGATOR]
+        n_m_type = type_counts[TYPE_MERGED]
 
         stats_dict = {}
-        stats_dict["uuid"] = str(uuid3(namespace=NAMESPACE_URL, name=key_name))
+        stats_dict["uuid"] = self.stats_uuid
         stats_dict["cycle"] = payment_cycle
         stats_dict["network"] = self.args.network
-        stats_dict["total_amount"] = int(
-            sum([rl.adjusted_amount for rl in payment_logs]) / MUTEZ_PER_TEZ
-        )
+        stats_dict["total_amount"] = int(total_amount // MUTEZ_PER_TEZ)
         stats_dict["nb_pay"] = int(len(payment_logs))
         stats_dict["nb_failed"] = nb_failed
         stats_dict["nb_unknown"] = nb_unknown
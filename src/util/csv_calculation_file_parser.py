@@ -1,6 +1,6 @@
 import csv
 from log_config import main_logger
-from Constants import RewardsType
+from Constants import RewardsType, REPORT_WRITE_BUFFER_SIZE
 
 from model.reward_log import RewardLog
 
@@ -12,37 +12,25 @@ class CsvCalculationFileParser:
         super().__init__()
 
     def parse(self, calculation_file, baking_address):
+        # a single pass over the report splits the baker row from the records
+        records = []
+        baker_rows = []
         with open(calculation_file, newline="") as f:
-            # read csv into list of dictionaries
-            dict_rows = [
-                {key: value for key, value in row.items()}
-                for row in csv.DictReader(f, delimiter=",", skipinitialspace=True)
-            ]
+            for row in csv.DictReader(f, delimiter=",", skipinitialspace=True):
+                if row["address"] == baking_address:
+                    baker_rows.append(row)
+                else:
+                    records.append(self.from_payment_csv_dict_row(row))
 
-            records = [
-                self.from_payment_csv_dict_row(row)
-                for row in dict_rows
-                if row["address"] != baking_address
-            ]
+        early_payout = self.is_early_payout(baker_rows[0])
+        baker_record = self.from_payment_csv_dict_row(baker_rows[0])
 
-            early_payout = [
-                self.is_early_payout(row)
-                for row in dict_rows
-                if row["address"] == baking_address
-            ][0]
-
-            baker_record = [
-                self.from_payment_csv_dict_row(row)
-                for row in dict_rows
-                if row["address"] == baking_address
-            ][0]
-
-            return (
-                records,
-                baker_record.amount,
-                RewardsType(baker_record.rewards_type),
-                early_payout,
-            )
+        return (
+            records,
+            baker_record.amount,
+            RewardsType(baker_record.rewards_type),
+            early_payout,
+        )
 
     @staticmethod
     def is_early_payout(row):
@@ -119,7 +107,9 @@ class CsvCalculationFileParser:
         elif rewards_type.isIdeal():
             rt = "I"
 
-        with open(report_file, "w", newline="") as f:
+        with open(
+            report_file, "w", newline="", buffering=REPORT_WRITE_BUFFER_SIZE
+        ) as f:
             csv_writer = csv.writer(
                 f, delimiter=",", quotechar='"', quoting=csv.QUOTE_MINIMAL
             )
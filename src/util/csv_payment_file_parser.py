@@ -1,6 +1,6 @@
 import csv
 
-from Constants import PaymentStatus
+from Constants import PaymentStatus, REPORT_WRITE_BUFFER_SIZE
 from model.reward_log import RewardLog
 
 
@@ -34,7 +34,9 @@ class CsvPaymentFileParser:
     @staticmethod
     def write(report_file, payment_logs):
         try:
-            with open(report_file, "w", newline="") as f:
+            with open(
+                report_file, "w", newline="", buffering=REPORT_WRITE_BUFFER_SIZE
+            ) as f:
                 csv_writer = csv.writer(
                     f, delimiter=",", quotechar='"', quoting=csv.QUOTE_MINIMAL
                 )
@@ -49,17 +51,17 @@ class CsvPaymentFileParser:
                     ]
                 )
 
-                for payment_log in payment_logs:
-                    csv_writer.writerow(
-                        [
-                            str(payment_log.paymentaddress),
-                            str(payment_log.type),
-                            int(payment_log.adjusted_amount),
-                            str(payment_log.hash) if payment_log.hash else "None",
-                            str(payment_log.paid.name).lower(),
-                            str(payment_log.desc),
-                        ]
-                    )
+                csv_writer.writerows(
+                    [
+                        str(payment_log.paymentaddress),
+                        str(payment_log.type),
+                        int(payment_log.adjusted_amount),
+                        str(payment_log.hash) if payment_log.hash else "None",
+                        str(payment_log.paid.name).lower(),
+                        str(payment_log.desc),
+                    ]
+                    for payment_log in payment_logs
+                )
 
         except Exception as e:
             import errno
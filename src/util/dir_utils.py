@@ -65,9 +65,13 @@ def payment_dir_c(pymnt_root, pymnt_cycle):
     return os.path.abspath(pymnt_root + "/" + str(pymnt_cycle))
 
 
-def remove_busy_file(file):
-    busy_file = get_busy_file(file)
-    if os.path.isfile(busy_file):
-        os.remove(busy_file)
+def remove_file(file):
+    try:
+        os.remove(file)
         return True
-    return False
+    except FileNotFoundError:
+        return False
+
+
+def remove_busy_file(file):
+    return remove_file(get_busy_file(file))
@@ -0,0 +1,39 @@
+from unittest import TestCase
+
+from calc.calculate_phase_base import BY_ZERO_BALANCE
+from calc.calculate_phaseZeroBalance import CalculatePhaseZeroBalance
+from model.reward_log import RewardLog, TYPE_DELEGATOR, TYPE_OWNER
+
+
+class TestCalculatePhaseZeroBalance(TestCase):
+    def make_rewards(self):
+        return [
+            RewardLog("tz1Alice01", TYPE_DELEGATOR, 10000, 0),
+            RewardLog("tz1Bob01", TYPE_DELEGATOR, 10000, 5000),
+            RewardLog("KT1Charlie01", TYPE_DELEGATOR, 10000, 0),
+            RewardLog("tz1Dave01", TYPE_OWNER, 10000, 0),
+        ]
+
+    def test_calculate_reactivate_zeroed(self):
+        rewards = self.make_rewards()
+
+        new_rewards = CalculatePhaseZeroBalance().calculate(rewards, True)
+
+        self.assertEqual(4, len(new_rewards))
+        self.assertEqual(
+            ["tz1Alice01"],
+            [rl.address for rl in new_rewards if rl.needs_activation],
+        )
+        self.assertFalse(any(rl.skipped for rl in new_rewards))
+
+    def test_calculate_skip_zeroed(self):
+        rewards = self.make_rewards()
+
+        new_rewards = CalculatePhaseZeroBalance().calculate(rewards, False)
+
+        self.assertEqual(4, len(new_rewards))
+        skipped = [rl for rl in new_rewards if rl.skipped]
+        self.assertEqual(["tz1Alice01"], [rl.address for rl in skipped])
+        self.assertFalse(skipped[0].payable)
+        self.assertEqual(BY_ZERO_BALANCE, skipped[0].desc)
+        self.assertFalse(any(rl.needs_activation for rl in new_rewards))
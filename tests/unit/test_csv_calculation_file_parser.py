@@ -0,0 +1,93 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from Constants import RewardsType
+from model.reward_log import RewardLog, TYPE_DELEGATOR, TYPE_OWNER
+from util.csv_calculation_file_parser import CsvCalculationFileParser
+
+BAKING_ADDRESS = "tz1Baker01"
+
+
+class TestCsvCalculationFileParser(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.report_file = os.path.join(self.temp_dir.name, "10.csv")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_write_and_parse(self):
+        rlA = RewardLog("tz1Alice01", TYPE_DELEGATOR, 10000, 500)
+        rlA.ratio = 0.75
+        rlA.amount = 750
+        rlA.adjusted_amount = 740
+        rlA.adjustment = -10
+        rlA.delegate_transaction_fee = 20
+        rlA.desc = "Alice, with a comma"
+
+        rlB = RewardLog("tz1Bob01", TYPE_OWNER, 3000, 0)
+        rlB.ratio = 0.25
+        rlB.amount = 250
+        rlB.adjusted_amount = 250
+        rlB.skip("Skipped for testing. ", 4)
+
+        CsvCalculationFileParser().write(
+            [rlA, rlB],
+            self.report_file,
+            1000,
+            RewardsType.ACTUAL,
+            BAKING_ADDRESS,
+            False,
+            True,
+        )
+
+        (
+            records,
+            total_amount,
+            rewards_type,
+            early_payout,
+        ) = CsvCalculationFileParser().parse(self.report_file, BAKING_ADDRESS)
+
+        self.assertEqual(1000, total_amount)
+        self.assertEqual(RewardsType.ACTUAL, rewards_type)
+        self.assertFalse(early_payout)
+        self.assertEqual(["tz1Alice01", "tz1Bob01"], [rl.address for rl in records])
+
+        alice, bob = records
+        self.assertEqual(TYPE_DELEGATOR, alice.type)
+        self.assertEqual(10000, alice.staking_balance)
+        self.assertEqual(740, alice.adjusted_amount)
+        self.assertEqual(-10, alice.adjustment)
+        self.assertEqual(20, alice.delegate_transaction_fee)
+        self.assertEqual("Alice, with a comma", alice.desc)
+        self.assertTrue(alice.payable)
+        self.assertFalse(alice.skipped)
+
+        self.assertFalse(bob.payable)
+        self.assertTrue(bob.skipped)
+        self.assertEqual(4, bob.skippedatphase)
+
+    def test_parse_early_payout(self):
+        rlA = RewardLog("tz1Alice01", TYPE_DELEGATOR, 10000, 500)
+
+        CsvCalculationFileParser().write(
+            [rlA],
+            self.report_file,
+            1000,
+            RewardsType.IDEAL,
+            BAKING_ADDRESS,
+            True,
+        )
+
+        (
+            records,
+            total_amount,
+            rewards_type,
+            early_payout,
+        ) = CsvCalculationFileParser().parse(self.report_file, BAKING_ADDRESS)
+
+        self.assertEqual(1, len(records))
+        self.assertEqual(RewardsType.IDEAL, rewards_type)
+        self.assertTrue(early_payout)
+        self.assertEqual(0, records[0].delegate_transaction_fee)
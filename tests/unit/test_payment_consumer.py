@@ -0,0 +1,294 @@
+import os
+import queue
+import tempfile
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+from uuid import NAMESPACE_URL, uuid3
+
+from Constants import PaymentStatus, RewardsType
+from model.reward_log import (
+    RewardLog,
+    key_by_type_balance,
+    TYPE_DELEGATOR,
+    TYPE_FOUNDER,
+    TYPE_MERGED,
+    TYPE_OWNER,
+)
+from pay.payment_batch import PaymentBatch
+from pay.payment_consumer import PaymentConsumer, count_and_log_failed
+from util.csv_calculation_file_parser import CsvCalculationFileParser
+from util.csv_payment_file_parser import CsvPaymentFileParser
+from util.dir_utils import (
+    get_calculation_report_file_path,
+    get_failed_payments_dir,
+    get_payment_report_file_path,
+    get_successful_payments_dir,
+)
+
+KEY_NAME = "tz1234567890123456789012345678901234"
+
+
+class TestPaymentConsumer(TestCase):
+    def make_consumer(self, **kwargs):
+        consumer_args = dict(
+            name="consumer0",
+            payments_dir=None,
+            key_name=KEY_NAME,
+            payments_queue=None,
+            node_addr=None,
+            client_manager=None,
+            network_config=None,
+            plugins_manager=MagicMock(),
+            rewards_type=RewardsType.ACTUAL,
+        )
+        consumer_args.update(kwargs)
+        return PaymentConsumer(**consumer_args)
+
+    def test_count_and_log_failed(self):
+
+        payment_logs = []
+        for i, status in enumerate(
+            [
+                PaymentStatus.PAID,
+                PaymentStatus.PAID,
+                PaymentStatus.FAIL,
+                PaymentStatus.INJECTED,
+                PaymentStatus.DONE,
+                PaymentStatus.AVOIDED,
+                PaymentStatus.UNDEFINED,
+            ]
+        ):
+            rl = RewardLog(
+                address="tz1Addr0{}".format(i),
+                type="D",
+                staking_balance=10000,
+                current_balance=0,
+            )
+            rl.paid = status
+            payment_logs.append(rl)
+
+        nb_paid, nb_failed, nb_injected = count_and_log_failed(payment_logs)
+
+        self.assertEqual(2, nb_paid)
+        self.assertEqual(1, nb_failed)
+        self.assertEqual(1, nb_injected)
+
+    def test_count_and_log_failed_empty(self):
+        self.assertEqual((0, 0, 0), count_and_log_failed([]))
+
+    def test_key_by_type_balance(self):
+
+        rlD1 = RewardLog("tz1Addr01", TYPE_DELEGATOR, 100, 0)
+        rlD2 = RewardLog("tz1Addr02", TYPE_DELEGATOR, 300, 0)
+        rlO = RewardLog("tz1Addr03", TYPE_OWNER, 50, 0)
+        rlF = RewardLog("tz1Addr04", TYPE_FOUNDER, 500, 0)
+        rlM = RewardLog("tz1Addr05", TYPE_MERGED, 1000, 0)
+
+        payment_items = [rlM, rlF, rlD1, rlO, rlD2]
+        payment_items.sort(key=key_by_type_balance)
+
+        self.assertEqual([rlD2, rlD1, rlO, rlF, rlM], payment_items)
+
+    def test_create_stats_dict(self):
+
+        args = MagicMock(
+            network="MAINNET",
+            background_service=False,
+            reward_data_provider="tzkt",
+            release_override=None,
+            payment_offset=None,
+            docker=False,
+        )
+        payment_consumer = self.make_consumer(args=args)
+
+        payment_logs = []
+        for i, (type, amount) in enumerate(
+            [
+                (TYPE_FOUNDER, 1500000),
+                (TYPE_OWNER, 2500000),
+                (TYPE_MERGED, 250000),
+                (TYPE_DELEGATOR, 750000),
+                (TYPE_DELEGATOR, 1000000),
+            ]
+        ):
+            rl = RewardLog("tz1Addr0{}".format(i), type, 0, 0)
+            rl.adjusted_amount = amount
+            payment_logs.append(rl)
+
+        stats_dict = payment_consumer.create_stats_dict(1, 0, 10, payment_logs, 2)
+
+        self.assertEqual(str(uuid3(NAMESPACE_URL, KEY_NAME)), stats_dict["uuid"])
+        self.assertEqual(6, stats_dict["total_amount"])
+        self.assertEqual(5, stats_dict["nb_pay"])
+        self.assertEqual(1, stats_dict["nb_founders"])
+        self.assertEqual(1, stats_dict["nb_owners"])
+        self.assertEqual(1, stats_dict["nb_merged"])
+        self.assertEqual(2, stats_dict["nb_delegators"])
+        self.assertEqual("A", stats_dict["rewards_type"])
+
+    @patch("pay.payment_consumer.sleep", MagicMock())
+    @patch("pay.payment_consumer.BatchPayer")
+    def test_consume_batch_nothing_to_pay(self, batch_payer):
+        batch_payer.return_value.pay.return_value = ([], 0, 0, 0)
+
+        with tempfile.TemporaryDirectory() as payments_dir:
+            get_successful_payments_dir(payments_dir, create=True)
+            plugins_manager = MagicMock()
+            payment_consumer = self.make_consumer(
+                payments_dir=payments_dir,
+                plugins_manager=plugins_manager,
+            )
+
+            rl = RewardLog("tz1Alice01", TYPE_DELEGATOR, 10000, 500)
+            rl.adjusted_amount = 1000
+            rl.paid = PaymentStatus.PAID
+            producer = MagicMock()
+            payment_batch = PaymentBatch(producer, 10, [rl])
+
+            self.assertTrue(payment_consumer._consume_batch(payment_batch))
+
+            # already paid items are still reported
+            report_file = get_payment_report_file_path(payments_dir, 10, 0)
+            self.assertTrue(os.path.isfile(report_file))
+            reported = CsvPaymentFileParser().parse(report_file, 10)
+            self.assertEqual(["tz1Alice01"], [r.address for r in reported])
+
+            producer.on_success.assert_called_once_with(payment_batch)
+            producer.on_fail.assert_not_called()
+            plugins_manager.send_payout_notification.assert_not_called()
+            plugins_manager.send_admin_notification.assert_not_called()
+
+    @patch("pay.payment_consumer.sleep", MagicMock())
+    @patch("pay.payment_consumer.BatchPayer")
+    def test_consume_batch_paid(self, batch_payer):
+        rlA = RewardLog("tz1Alice01", TYPE_DELEGATOR, 10000, 500)
+        rlA.adjusted_amount = 1000
+        rlB = RewardLog("tz1Bob01", TYPE_DELEGATOR, 5000, 500)
+        rlB.adjusted_amount = 500
+
+        def pay(payment_items, dry_run=None):
+            for pi in payment_items:
+                pi.paid = PaymentStatus.PAID
+                pi.delegator_transaction_fee = 300
+            return payment_items, 1, 1500, 10
+
+        batch_payer.return_value.pay.side_effect = pay
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            payments_dir = os.path.join(temp_dir, "payments")
+            get_successful_payments_dir(payments_dir, create=True)
+            calculations_dir = os.path.join(temp_dir, "calculations")
+            os.makedirs(calculations_dir)
+            calculation_file = get_calculation_report_file_path(calculations_dir, 10)
+            CsvCalculationFileParser().write(
+                [rlA, rlB],
+                calculation_file,
+                1500,
+                RewardsType.ACTUAL,
+                "tz1Baker01",
+                False,
+            )
+
+            plugins_manager = MagicMock()
+            payment_consumer = self.make_consumer(
+                payments_dir=payments_dir,
+                plugins_manager=plugins_manager,
+                calculations_dir=calculations_dir,
+                baking_address="tz1Baker01",
+            )
+            producer = MagicMock()
+            payment_batch = PaymentBatch(producer, 10, [rlA, rlB])
+
+            self.assertTrue(payment_consumer._consume_batch(payment_batch))
+
+            report_file = get_payment_report_file_path(payments_dir, 10, 0)
+            reported = CsvPaymentFileParser().parse(report_file, 10)
+            self.assertEqual(["tz1Alice01", "tz1Bob01"], [r.address for r in reported])
+
+            records, _, _, _ = CsvCalculationFileParser().parse(
+                calculation_file, "tz1Baker01"
+            )
+            self.assertEqual([300, 300], [r.delegator_transaction_fee for r in records])
+
+            producer.on_success.assert_called_once_with(payment_batch)
+            plugins_manager.send_payout_notification.assert_called_once_with(
+                10, 1500, 2
+            )
+            (
+                subject,
+                _,
+                report_files,
+                _,
+            ) = plugins_manager.send_admin_notification.call_args[0]
+            self.assertEqual(
+                "Reward Payouts for Cycle 10 Completed Successfully!", subject
+            )
+            self.assertEqual([report_file], report_files)
+            # payout notification goes out before the admin notification
+            self.assertEqual(
+                ["send_payout_notification", "send_admin_notification"],
+                [name for name, _, _ in plugins_manager.mock_calls],
+            )
+
+    @patch("pay.payment_consumer.sleep", MagicMock())
+    @patch("pay.payment_consumer.BatchPayer")
+    def test_consume_batch_failed_subject(self, batch_payer):
+        statuses = [PaymentStatus.PAID, PaymentStatus.FAIL, PaymentStatus.INJECTED]
+        payment_items = []
+        for i in range(len(statuses)):
+            rl = RewardLog("tz1Addr0{}".format(i), TYPE_DELEGATOR, 10000, 500)
+            rl.adjusted_amount = 1000
+            payment_items.append(rl)
+
+        def pay(payment_items, dry_run=None):
+            for pi, status in zip(payment_items, statuses):
+                pi.paid = status
+            return payment_items, 1, 3000, 10
+
+        batch_payer.return_value.pay.side_effect = pay
+
+        with tempfile.TemporaryDirectory() as payments_dir:
+            get_successful_payments_dir(payments_dir, create=True)
+            get_failed_payments_dir(payments_dir, create=True)
+            plugins_manager = MagicMock()
+            payment_consumer = self.make_consumer(
+                payments_dir=payments_dir,
+                plugins_manager=plugins_manager,
+            )
+            producer = MagicMock()
+            payment_batch = PaymentBatch(producer, 10, payment_items)
+
+            self.assertTrue(payment_consumer._consume_batch(payment_batch))
+
+            producer.on_fail.assert_called_once_with(payment_batch)
+            subject = plugins_manager.send_admin_notification.call_args[0][0]
+            self.assertEqual(
+                "Reward Payouts for Cycle 10 attempted, 1 failed, "
+                "1 injected but final state not known",
+                subject,
+            )
+
+    @patch("pay.payment_consumer.disk_is_full", return_value=False)
+    def test_run_consumes_queued_batches(self, disk_is_full):
+        payments_queue = queue.Queue()
+        payment_batches = [PaymentBatch(None, cycle, []) for cycle in range(10, 20)]
+        for payment_batch in payment_batches:
+            payments_queue.put(payment_batch)
+        payments_queue.put(PaymentBatch(None, 20, [RewardLog.ExitInstance()]))
+
+        payment_consumer = self.make_consumer(payments_queue=payments_queue)
+
+        with patch.object(
+            payment_consumer,
+            "_consume_batch",
+            side_effect=payment_consumer._consume_batch,
+        ) as consume_batch:
+            payment_consumer.run()
+
+        self.assertEqual(
+            list(range(10, 21)),
+            [call[0][0].cycle for call in consume_batch.call_args_list],
+        )
+        self.assertTrue(payments_queue.empty())
+        # all batches are consumed well within one disk check interval
+        disk_is_full.assert_called_once()